@@ -1,29 +1,91 @@
-from passlib.context import CryptContext
+import bcrypt
+import threading
+from collections import OrderedDict
 from jose import JWTError, jwt
-from datetime import datetime, timedelta
+from datetime import timedelta
+import base64
+import hashlib
+import hmac
 import os
+import time
+import orjson
 
 SECRET_KEY = os.getenv("JWT_SECRET", "supersecretkey")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
+_ACCESS_TOKEN_EXPIRE_SECONDS = ACCESS_TOKEN_EXPIRE_MINUTES * 60
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+def _b64url(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+# HS256 tokens always share the same header and key; encode them once
+_JWT_HEADER_B64 = _b64url(b'{"alg":"HS256","typ":"JWT"}')
+_SECRET_KEY_BYTES = SECRET_KEY.encode("utf-8")
+
+# decoded payloads of verified tokens, keyed by token digest, kept until "exp";
+# LRU (hits move to the end, the front is evicted). Routes decode tokens from
+# threadpool workers concurrently, so every access holds _token_cache_lock
+TOKEN_CACHE_SIZE = 1024
+_token_cache: "OrderedDict[bytes, tuple[dict, float]]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+BCRYPT_ROUNDS = 12
+
+# bcrypt only looks at the first 72 bytes; passlib truncated silently, keep that
+def _password_bytes(password: str) -> bytes:
+    return password.encode("utf-8")[:72]
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(_password_bytes(password), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode("utf-8")
 
 def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_context.verify(plain, hashed)
+    # checkpw re-hashes and compares in constant time; never compare hashes with ==
+    try:
+        return bcrypt.checkpw(_password_bytes(plain), hashed.encode("utf-8"))
+    except ValueError:
+        # malformed / non-bcrypt hash stored for this user
+        return False
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
-    expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
-    to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    # "exp" is epoch seconds; stay in ints instead of building datetimes
+    lifetime = expires_delta.total_seconds() if expires_delta else _ACCESS_TOKEN_EXPIRE_SECONDS
+    to_encode.update({"exp": int(time.time() + lifetime)})
+
+    signing_input = f"{_JWT_HEADER_B64}.{_b64url(orjson.dumps(to_encode))}"
+    signature = hmac.new(_SECRET_KEY_BYTES, signing_input.encode("ascii"), hashlib.sha256).digest()
+    return f"{signing_input}.{_b64url(signature)}"
 
 def decode_token(token: str):
+    # cheap structural check: junk tokens never reach hashing or jwt.decode
+    if not token or len(token) < 32 or token.count(".") != 2 or not token.isascii():
+        return None
+
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    with _token_cache_lock:
+        cached = _token_cache.get(key)
+        if cached:
+            payload, exp = cached
+            if time.time() < exp:
+                _token_cache.move_to_end(key)
+                # a copy: callers must not be able to edit the cached claims
+                return dict(payload)
+            _token_cache.pop(key, None)
+
     try:
+        # jose verifies the HS256 signature with hmac.compare_digest
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         return None
+
+    # only successfully verified tokens are cached
+    exp = payload.get("exp")
+    if exp is not None:
+        with _token_cache_lock:
+            _token_cache[key] = (dict(payload), exp)
+            _token_cache.move_to_end(key)
+            while len(_token_cache) > TOKEN_CACHE_SIZE:
+                _token_cache.popitem(last=False)
+    return payload
@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
 from dotenv import load_dotenv
 import os
@@ -10,8 +11,43 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL is missing — check .env loading")
 
-engine = create_engine(DATABASE_URL)
+# resolve the driver the dialect will actually use: a bare postgresql:// URL
+# means psycopg (v3) on SQLAlchemy 2.1, psycopg2 only when spelled out
+engine_kwargs = {}
+_driver = make_url(DATABASE_URL).get_dialect().driver
+if _driver == "psycopg2":
+    # multi-row VALUES for bulk INSERTs, execute_batch for bulk UPDATE/DELETE
+    engine_kwargs.update(
+        executemany_mode="values_plus_batch",
+        insertmanyvalues_page_size=1000,
+        executemany_batch_page_size=500,
+    )
+elif _driver == "psycopg":
+    # psycopg 3 already batches executemany (pipeline mode) for UPDATE/DELETE
+    # and has no executemany_mode; only size the multi-row INSERT pages
+    engine_kwargs.update(insertmanyvalues_page_size=1000)
+
+engine = create_engine(
+    DATABASE_URL,
+    pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+    pool_pre_ping=True,
+    **engine_kwargs,
+)
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
 Base = declarative_base()
+
+
+def get_db():
+    """
+    FastAPI dependency: one session per request.
+    FastAPI caches dependencies per request, so every Depends(get_db)
+    in the same request shares this session; it is always closed.
+    """
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -0,0 +1,28 @@
+"""add user_progress (user_id, word_id) index
+
+Revision ID: 3f1c9a7d2b64
+Revises: 79e9b7392f39
+Create Date: 2026-10-15 10:12:41.207318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a7d2b64'
+down_revision: Union[str, None] = '79e9b7392f39'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_user_progress_user_word', 'user_progress', ['user_id', 'word_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_user_progress_user_word', table_name='user_progress')
@@ -0,0 +1,41 @@
+"""make user_progress (user_id, word_id) unique
+
+Revision ID: a8e2d5c41f07
+Revises: 3f1c9a7d2b64
+Create Date: 2026-10-15 11:47:03.918264
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8e2d5c41f07'
+down_revision: Union[str, None] = '3f1c9a7d2b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # record_attempt used to read the first matching row, so duplicates
+    # (from concurrent first attempts) keep the oldest one
+    op.execute(
+        """
+        DELETE FROM user_progress a
+        USING user_progress b
+        WHERE a.user_id = b.user_id
+          AND a.word_id = b.word_id
+          AND a.id > b.id
+        """
+    )
+    op.drop_index('ix_user_progress_user_word', table_name='user_progress')
+    op.create_index('ix_user_progress_user_word', 'user_progress', ['user_id', 'word_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_user_progress_user_word', table_name='user_progress')
+    op.create_index('ix_user_progress_user_word', 'user_progress', ['user_id', 'word_id'], unique=False)
@@ -0,0 +1,43 @@
+"""make user_progress.mastered boolean
+
+Revision ID: c5d07e3b9a12
+Revises: a8e2d5c41f07
+Create Date: 2026-10-15 14:21:36.507119
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d07e3b9a12'
+down_revision: Union[str, None] = 'a8e2d5c41f07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # converted in place; "yes" -> true, "no" / NULL -> false
+    op.alter_column(
+        'user_progress', 'mastered',
+        existing_type=sa.String(),
+        type_=sa.Boolean(),
+        postgresql_using="COALESCE(mastered = 'yes', false)",
+        nullable=False,
+        server_default=sa.false(),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        'user_progress', 'mastered',
+        existing_type=sa.Boolean(),
+        type_=sa.String(),
+        postgresql_using="CASE WHEN mastered THEN 'yes' ELSE 'no' END",
+        nullable=True,
+        server_default=None,
+    )
@@ -1,7 +1,6 @@
 # app/main.py
 import os
 import pathlib
-import warnings
 
 # ================================
 # 1. Load .env very early
@@ -10,19 +9,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # ================================
-# 2. Suppress only noisy pydub warnings
-# ================================
-warnings.filterwarnings(
-    "ignore",
-    message="Couldn't find ffmpeg or avconv - defaulting to ffmpeg, but may not work",
-)
-warnings.filterwarnings(
-    "ignore",
-    message="Couldn't find ffprobe or avprobe - defaulting to ffprobe, but may not work",
-)
-
-# ================================
-# 3. Compute absolute FFmpeg paths
+# 2. Compute absolute FFmpeg paths
 # ================================
 PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
 
@@ -33,7 +20,8 @@ FFMPEG_PATH = str((PROJECT_ROOT / _ffmpeg_rel).resolve()) if _ffmpeg_rel else No
 FFPROBE_PATH = str((PROJECT_ROOT / _ffprobe_rel).resolve()) if _ffprobe_rel else None
 
 # ================================
-# 4. Export FFmpeg binaries to PATH
+# 3. Export FFmpeg binaries to PATH
+#    (stt_service runs FFMPEG_BINARY to decode uploads)
 # ================================
 if FFMPEG_PATH:
     bin_dir = os.path.dirname(FFMPEG_PATH)
@@ -44,25 +32,14 @@ if FFPROBE_PATH:
     os.environ["FFPROBE_BINARY"] = FFPROBE_PATH
 
 # ================================
-# 5. Configure pydub AFTER exporting FFmpeg
+# 4. FastAPI + DB setup
 # ================================
-from pydub import AudioSegment
-
-if FFMPEG_PATH:
-    AudioSegment.converter = FFMPEG_PATH
-
-if FFPROBE_PATH:
-    try:
-        AudioSegment.ffprobe = FFPROBE_PATH
-    except Exception:
-        # some pydub versions don't have this attribute
-        pass
+from contextlib import asynccontextmanager
 
-# ================================
-# 6. FastAPI + DB setup
-# ================================
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.database.connection import Base, engine
 
@@ -80,17 +57,34 @@ from app.routes.progress import router as progress_router
 from app.routes.speech import router as speech_router
 from app.routes.adaptive import router as adaptive_router
 
-# If you later add adaptive-specific routes, import and include here:
-# from app.routes.adaptive import router as adaptive_router
+from app.utils.levels import load_levels
+from app.utils.phonetics import get_phonetics_syllables
+
+# Create DB tables (only if they don't exist).
+# Set AUTO_CREATE_TABLES=0 when the schema is managed by Alembic to skip the
+# per-table metadata round trips on every startup.
+if os.getenv("AUTO_CREATE_TABLES", "1").lower() in ("1", "true", "yes"):
+    Base.metadata.create_all(bind=engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # pronouncing parses CMUdict on first lookup; do it (and fill the phonetics
+    # cache for every level word) before serving instead of on the first request
+    for words in load_levels().values():
+        for word in words:
+            get_phonetics_syllables(word)
+    yield
 
-# Create DB tables (only if they don't exist)
-Base.metadata.create_all(bind=engine)
 
 # FastAPI app
-app = FastAPI(title="LEARN Phonetics API")
+app = FastAPI(
+    title="LEARN Phonetics API",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 # ================================
-# 7. CORS configuration
+# 5. CORS configuration
 # ================================
 app.add_middleware(
     CORSMiddleware,
@@ -100,21 +94,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# compress larger JSON payloads (progress / level status word lists)
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 # ================================
-# 8. Register API routers
+# 6. Register API routers
 # ================================
-# Auth / users
-app.include_router(users_router, prefix="/api", tags=["users"])
-app.include_router(learning_router, prefix="/api/learning", tags=["learning"])
-app.include_router(progress_router, prefix="/api/learning", tags=["progress"])
-app.include_router(speech_router, prefix="/api", tags=["speech"])
+# each router declares its own prefix + tags; include every router exactly once
+app.include_router(users_router, prefix="/api")
+app.include_router(learning_router, prefix="/api/learning")
+app.include_router(progress_router, prefix="/api/learning")
+app.include_router(speech_router, prefix="/api")
 app.include_router(adaptive_router, prefix="/api")
 
-# If you add adaptive router:
-# app.include_router(adaptive_router, prefix="/api/learning", tags=["adaptive"])
-
 # ================================
-# 9. Optional debug logs
+# 7. Optional debug logs
 # ================================
 print("FFMPEG_PATH resolved to:", FFMPEG_PATH)
 print("FFPROBE_PATH resolved to:", FFPROBE_PATH)
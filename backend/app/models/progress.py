@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, String, Float, DateTime
+from sqlalchemy import Boolean, Column, Integer, ForeignKey, Float, DateTime, Index, false
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database.connection import Base
@@ -13,7 +13,7 @@ class UserProgress(Base):
 
     score = Column(Float, default=0.0)
     attempts = Column(Integer, default=0)
-    mastered = Column(String, default="no")
+    mastered = Column(Boolean, nullable=False, default=False, server_default=false())
     total_time = Column(Float, default=0.0)
     last_attempt = Column(DateTime, default=datetime.utcnow)
 
@@ -25,3 +25,9 @@ class UserProgress(Base):
 
     user = relationship("User")
     word = relationship("Word")
+
+    # every progress lookup is by user, most by (user, word); unique so
+    # record_attempt can upsert on it
+    __table_args__ = (
+        Index("ix_user_progress_user_word", "user_id", "word_id", unique=True),
+    )
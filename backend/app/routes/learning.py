@@ -15,15 +15,17 @@ This part does NOT care about user_id yet; it prepares the word:
 User-specific progress is updated when they speak via /learn/speech/analyze.
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
+from sqlalchemy.orm import Session
 
 from app.services.learning_service import process_text, store_word, ensure_level_word
 from app.utils.levels import load_levels, get_words_for_level
 from app.utils.phonetics import get_phonetics_syllables
 from app.utils.tts_handler import get_or_generate_tts
 
-from app.database.connection import SessionLocal
+from app.database.connection import get_db
 
 router = APIRouter(prefix="/learn", tags=["learning"])
 
@@ -40,13 +42,18 @@ class WordRequest(BaseModel):
 #  FREE-INPUT MODE
 # -------------------------
 @router.post("/analyze")
-def analyze_text(data: WordRequest):
+def analyze_text(
+    data: WordRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
     text = data.text.strip()
     if not text:
         raise HTTPException(status_code=400, detail="No text provided")
 
-    # returns phonetics + syllables + TTS path
-    return process_text(text, rate=data.rate)
+    # returns phonetics + syllables + TTS path; a sentence that isn't cached
+    # yet is rendered after the response is sent
+    return process_text(db, text, rate=data.rate, background_tasks=background_tasks)
 
 
 # -------------------------
@@ -56,7 +63,8 @@ def analyze_text(data: WordRequest):
 def list_levels():
     """Get available difficulty levels (from JSON config)."""
     levels = list(load_levels().keys())
-    return {"levels": levels}
+    # plain str lists: serialize directly, no jsonable_encoder pass
+    return ORJSONResponse({"levels": levels})
 
 
 @router.get("/levels/{level}")
@@ -65,7 +73,7 @@ def get_level_words(level: str):
     words = get_words_for_level(level)
     if not words:
         raise HTTPException(status_code=404, detail="Level not found")
-    return {"level": level, "words": words}
+    return ORJSONResponse({"level": level, "words": words})
 
 
 @router.post("/levels/{level}/process/{word}")
@@ -73,6 +81,7 @@ def process_level_word(
     level: str,
     word: str,
     rate: int = Query(105, description="Speech speed"),
+    db: Session = Depends(get_db),
 ):
     """
     Analyze + TTS + persist a level word:
@@ -89,13 +98,9 @@ def process_level_word(
             detail=f"'{word}' is not available in level '{level}'",
         )
 
-    db = SessionLocal()
-    try:
-        data = get_phonetics_syllables(word)
-        store_word(db, word, data)
-        ensure_level_word(db, level, word)
-    finally:
-        db.close()
+    data = get_phonetics_syllables(word)
+    store_word(db, word, data)
+    ensure_level_word(db, level, word)
 
     audio_path = get_or_generate_tts(word, rate=rate)
 
@@ -1,8 +1,9 @@
 # app/routes/progress.py
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
+from sqlalchemy.orm import Session
 
-from app.database.connection import SessionLocal
+from app.database.connection import get_db
 from app.services.progress_service import (
     record_attempt,
     get_user_progress,
@@ -26,12 +27,8 @@ class AttemptIn(BaseModel):
 # 1) Manual record
 # --------------------------------------------------
 @router.post("/record")
-def record_attempt_route(data: AttemptIn):
-    db = SessionLocal()
-    try:
-        res = record_attempt(db, data.user_id, data.word, data.score, data.time_spent)
-    finally:
-        db.close()
+def record_attempt_route(data: AttemptIn, db: Session = Depends(get_db)):
+    res = record_attempt(db, data.user_id, data.word, data.score, data.time_spent)
 
     if "error" in res:
         raise HTTPException(404, res["error"])
@@ -42,12 +39,8 @@ def record_attempt_route(data: AttemptIn):
 # 2) Full user progress
 # --------------------------------------------------
 @router.get("/{user_id}")
-def get_progress_route(user_id: int):
-    db = SessionLocal()
-    try:
-        data = get_user_progress(db, user_id)
-    finally:
-        db.close()
+def get_progress_route(user_id: int, db: Session = Depends(get_db)):
+    data = get_user_progress(db, user_id)
     return data
 
 
@@ -55,12 +48,8 @@ def get_progress_route(user_id: int):
 # 3) Traditional recommender
 # --------------------------------------------------
 @router.get("/{user_id}/recommend")
-def recommend_next(user_id: int):
-    db = SessionLocal()
-    try:
-        data = recommend_next_word(db, user_id)
-    finally:
-        db.close()
+def recommend_next(user_id: int, db: Session = Depends(get_db)):
+    data = recommend_next_word(db, user_id)
     return data
 
 
@@ -68,12 +57,8 @@ def recommend_next(user_id: int):
 # 4) Level status
 # --------------------------------------------------
 @router.get("/{user_id}/levels/{level}/status")
-def level_status(user_id: int, level: str):
-    db = SessionLocal()
-    try:
-        data = get_level_status(db, user_id, level)
-    finally:
-        db.close()
+def level_status(user_id: int, level: str, db: Session = Depends(get_db)):
+    data = get_level_status(db, user_id, level)
 
     if "error" in data:
         raise HTTPException(404, data["error"])
@@ -84,10 +69,9 @@ def level_status(user_id: int, level: str):
 # 5) Adaptive Engine (NEW)
 # --------------------------------------------------
 @router.get("/{user_id}/levels/{level}/adaptive")
-def adaptive_route(user_id: int, level: str):
-    db = SessionLocal()
-    try:
-        data = adaptive_next_word(db, user_id, level)
-    finally:
-        db.close()
+def adaptive_route(user_id: int, level: str, db: Session = Depends(get_db)):
+    data = adaptive_next_word(db, user_id, level)
+
+    if "error" in data:
+        raise HTTPException(404, data["error"])
     return data
@@ -9,49 +9,101 @@ POST /api/learn/speech/analyze
     user_id: optional int
 
 Flow:
-1. Save uploaded audio to a temp file.
+1. Save uploaded audio to a temp file (tmpfs when available).
 2. Call analyze_audio_file() → Vosk STT + scoring + word-level feedback.
-3. analyze_audio_file() will call record_attempt() if user_id is provided.
+3. If user_id is provided, save_attempt() → record_attempt() runs as a
+   background task after the response is sent.
+
+WebSocket /api/learn/speech/stream?expected=...&user_id=...
+- client sends binary frames of raw 16kHz mono 16-bit PCM while recording,
+  then the text frame "end"
+- at most STREAM_MAX_SECONDS of audio (STREAM_MAX_BYTES) and
+  STREAM_TIMEOUT_SECONDS of wall-clock per session; exceeding either, or
+  sending any other text frame, gets {"error": ...} and the socket closed
+- at most STREAM_MAX_CONCURRENT sessions at once; further connections get
+  {"error": ...} and close code 1013 (try again later)
+- server answers each frame with {"partial": ...} (current hypothesis) or
+  {"text": ...} (finished segment), and after "end" sends {"final": result}
+  with the same scoring as /analyze
 """
 
-from fastapi import APIRouter, File, UploadFile, Form, HTTPException
+from fastapi import (
+    APIRouter, BackgroundTasks, File, UploadFile, Form, HTTPException,
+    WebSocket, WebSocketDisconnect,
+)
+from fastapi.concurrency import run_in_threadpool
 from typing import Optional
+import asyncio
+import orjson
 import os
-import time
+import shutil
+import uuid
 from pathlib import Path
 
-from app.services.stt_service import analyze_audio_file
+from app.services.stt_service import (
+    StreamingRecognition,
+    analyze_audio_file,
+    save_attempt,
+    score_recognition,
+)
 
 router = APIRouter(prefix="/learn/speech", tags=["speech"])
 
-UPLOAD_DIR = os.getenv("UPLOAD_DIR", "tmp/uploads")
+# uploads only live for the duration of one request: keep them on tmpfs when
+# the host has one so saving + decoding never touches the physical disk
+_DEFAULT_UPLOAD_DIR = "/dev/shm/uploads" if os.path.isdir("/dev/shm") else "tmp/uploads"
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", _DEFAULT_UPLOAD_DIR)
 Path(UPLOAD_DIR).mkdir(parents=True, exist_ok=True)
 
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# live streams hold a recognizer and a threadpool slot per chunk: bound them
+STREAM_MAX_SECONDS = int(os.getenv("STREAM_MAX_SECONDS", "60"))
+STREAM_MAX_BYTES = STREAM_MAX_SECONDS * 16000 * 2  # 16kHz mono 16-bit PCM
+STREAM_TIMEOUT_SECONDS = int(os.getenv("STREAM_TIMEOUT_SECONDS", "120"))
+STREAM_MAX_CONCURRENT = int(os.getenv("STREAM_MAX_CONCURRENT", "8"))
+_stream_slots = asyncio.Semaphore(STREAM_MAX_CONCURRENT)
+
+# WebSocket close codes (RFC 6455)
+WS_UNSUPPORTED_DATA = 1003
+WS_POLICY_VIOLATION = 1008
+WS_MESSAGE_TOO_BIG = 1009
+WS_TRY_AGAIN_LATER = 1013
+
+
+def _save_upload(src, dest_path: str) -> None:
+    """Copy the upload's spooled temp file to dest_path in bounded chunks."""
+    with open(dest_path, "wb") as out_f:
+        shutil.copyfileobj(src, out_f, UPLOAD_CHUNK_SIZE)
+
 
 @router.post("/analyze")
 async def speech_analyze(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     expected: str = Form(...),
     user_id: Optional[int] = Form(None),
 ):
-    filename = file.filename or "upload"
-    safe_path = os.path.join(UPLOAD_DIR, f"{int(time.time() * 1000)}_{filename}")
+    filename = Path(file.filename or "upload").name
+    safe_path = os.path.join(UPLOAD_DIR, f"{uuid.uuid4().hex}_{filename}")
 
-    # Save uploaded file
+    # Save uploaded file: one threadpool hop for the whole copy instead of one
+    # per chunk, never holding more than UPLOAD_CHUNK_SIZE in memory
     try:
-        data = await file.read()
-        with open(safe_path, "wb") as out_f:
-            out_f.write(data)
+        await file.seek(0)
+        await run_in_threadpool(_save_upload, file.file, safe_path)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save upload: {str(e)}")
 
-    # Analyze with STT + scoring
+    # Analyze with STT + scoring (ffmpeg and Vosk block, keep them off the
+    # event loop); the progress write happens after the response is sent
     try:
-        res = analyze_audio_file(
+        res = await run_in_threadpool(
+            analyze_audio_file,
             safe_path,
             expected_word=expected,
             user_id=user_id,
-            record=bool(user_id),
+            record=False,
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to analyze audio: {str(e)}")
@@ -61,4 +113,95 @@ async def speech_analyze(
         except Exception:
             pass
 
+    if user_id:
+        background_tasks.add_task(
+            save_attempt, user_id, expected, res["word_level"]["avg_word_score"]
+        )
+
     return {"ok": True, "result": res}
+
+
+async def _close_with_error(ws: WebSocket, code: int, detail: str) -> None:
+    await ws.send_text(orjson.dumps({"error": detail}).decode())
+    await ws.close(code=code)
+
+
+@router.websocket("/stream")
+async def speech_stream(ws: WebSocket, expected: str, user_id: Optional[int] = None):
+    await ws.accept()
+    # refuse instead of queueing: a waiting client would only burn its timeout
+    if _stream_slots.locked():
+        await _close_with_error(
+            ws, WS_TRY_AGAIN_LATER, "Too many concurrent speech streams",
+        )
+        return
+    async with _stream_slots:
+        res = await _stream_session(ws, expected)
+
+    if res is not None and user_id:
+        await run_in_threadpool(
+            save_attempt, user_id, expected, res["word_level"]["avg_word_score"]
+        )
+
+
+async def _stream_session(ws: WebSocket, expected: str) -> Optional[dict]:
+    """
+    Run one accepted stream to completion. Returns the scored result after
+    "end", or None when the session was closed early or the client left.
+    """
+    stream = await run_in_threadpool(StreamingRecognition)
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + STREAM_TIMEOUT_SECONDS
+    received = 0
+
+    try:
+        last_partial = None
+        while True:
+            try:
+                msg = await asyncio.wait_for(ws.receive(), timeout=deadline - loop.time())
+            except asyncio.TimeoutError:
+                await _close_with_error(
+                    ws, WS_POLICY_VIOLATION,
+                    f"Session exceeded {STREAM_TIMEOUT_SECONDS}s without \"end\"",
+                )
+                return None
+            if msg["type"] == "websocket.disconnect":
+                return None
+
+            chunk = msg.get("bytes")
+            if chunk:
+                received += len(chunk)
+                if received > STREAM_MAX_BYTES:
+                    await _close_with_error(
+                        ws, WS_MESSAGE_TOO_BIG,
+                        f"Audio longer than {STREAM_MAX_SECONDS}s",
+                    )
+                    return None
+                # Vosk blocks; one chunk at a time per connection, off the loop
+                update = await run_in_threadpool(stream.feed, chunk)
+                if "partial" in update:
+                    # skip repeats so silence doesn't flood the client
+                    if update["partial"] == last_partial:
+                        continue
+                    last_partial = update["partial"]
+                else:
+                    last_partial = None
+                await ws.send_text(orjson.dumps(update).decode())
+            elif msg.get("text") == "end":
+                break
+            elif msg.get("text") is not None:
+                await _close_with_error(
+                    ws, WS_UNSUPPORTED_DATA,
+                    'Expected binary PCM frames or the text frame "end"',
+                )
+                return None
+
+        recognized, confidence = await run_in_threadpool(stream.finish)
+        res = score_recognition(expected, recognized, confidence)
+        await ws.send_text(orjson.dumps({"final": res}).decode())
+        await ws.close()
+    except WebSocketDisconnect:
+        return None
+
+    return res
@@ -10,9 +10,13 @@ These are used by the frontend; the learning/progress/speech
 endpoints just need the user_id (frontend can store it after login).
 """
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from app.database.connection import SessionLocal
+from sqlalchemy import select, bindparam
+from sqlalchemy.orm import Session
+from app.database.connection import SessionLocal, get_db
 from app.models.user import User
 from app.auth.auth_utils import (
     hash_password,
@@ -23,6 +27,10 @@ from app.auth.auth_utils import (
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+# built once; register/login only bind the email and load just the columns they use
+SELECT_USER_ID_BY_EMAIL = select(User.id).where(User.email == bindparam("email"))
+SELECT_LOGIN_BY_EMAIL = select(User.id, User.password).where(User.email == bindparam("email"))
+
 
 class RegisterIn(BaseModel):
     name: str
@@ -36,38 +44,42 @@ class LoginIn(BaseModel):
 
 
 @router.post("/register")
-def register_user(data: RegisterIn):
+def register_user(data: RegisterIn, db: Session = Depends(get_db)):
+    existing = db.execute(SELECT_USER_ID_BY_EMAIL, {"email": data.email}).scalar_one_or_none()
+    if existing is not None:
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    hashed = hash_password(data.password)
+    new_user = User(name=data.name, email=data.email, password=hashed)
+    db.add(new_user)
+    # id comes back from the INSERT; read it before commit expires the object
+    db.flush()
+    user_id = new_user.id
+    db.commit()
+    return ORJSONResponse({"message": "User registered", "user_id": user_id})
+
+
+def _get_login_row(email: str):
+    """(id, password hash) row for this email, or None."""
     db = SessionLocal()
     try:
-        existing = db.query(User).filter(User.email == data.email).first()
-        if existing:
-            raise HTTPException(status_code=400, detail="Email already registered")
-
-        hashed = hash_password(data.password)
-        new_user = User(name=data.name, email=data.email, password=hashed)
-        db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
-        return {"message": "User registered", "user_id": new_user.id}
+        return db.execute(SELECT_LOGIN_BY_EMAIL, {"email": email}).one_or_none()
     finally:
         db.close()
 
 
 @router.post("/login")
-def login_user(data: LoginIn):
-    db = SessionLocal()
-    try:
-        user = db.query(User).filter(User.email == data.email).first()
-    finally:
-        db.close()
+async def login_user(data: LoginIn):
+    # DB lookup and bcrypt both block, keep them off the event loop
+    user = await run_in_threadpool(_get_login_row, data.email)
 
-    if not user or not verify_password(data.password, user.password):
+    if not user or not await run_in_threadpool(verify_password, data.password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials"
         )
 
     token = create_access_token({"sub": str(user.id)})
-    return {"access_token": token, "token_type": "bearer", "user_id": user.id}
+    return ORJSONResponse({"access_token": token, "token_type": "bearer", "user_id": user.id})
 
 
 @router.get("/me")
@@ -78,4 +90,4 @@ def get_me(token: str):
     payload = decode_token(token)
     if not payload:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
-    return {"user_id": payload.get("sub")}
+    return ORJSONResponse({"user_id": payload.get("sub")})
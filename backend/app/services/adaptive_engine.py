@@ -1,5 +1,6 @@
 # app/services/adaptive_engine.py
 
+from sqlalchemy import and_
 from sqlalchemy.orm import Session
 from app.models.word import Word
 from app.models.progress import UserProgress
@@ -21,35 +22,33 @@ def get_next_adaptive_word(db: Session, user_id: int, level: str):
     if not level_words:
         return {"error": "No words found in this level"}
 
-    # 2) Fetch Word objects
-    word_objs = db.query(Word).filter(Word.text.in_(level_words)).all()
-    word_ids = {w.text: w.id for w in word_objs}
-
-    # 3) Fetch user's progress
-    progress_entries = (
-        db.query(UserProgress)
-        .filter(UserProgress.user_id == user_id,
-                UserProgress.word_id.in_(word_ids.values()))
+    # 2) Fetch Word objects + user's progress in one LEFT JOIN
+    #    (progress is None for words never attempted)
+    rows = (
+        db.query(Word, UserProgress)
+        .outerjoin(UserProgress, and_(UserProgress.word_id == Word.id,
+                                      UserProgress.user_id == user_id))
+        .filter(Word.text.in_(level_words))
         .all()
     )
 
-    progress_map = {p.word_id: p for p in progress_entries}
-
-    # Container for ranking
-    ranked = []
-
-    for w in word_objs:
-        p = progress_map.get(w.id)
+    # 3) Single pass: track the most urgent word (lowest priority; first one
+    #    wins ties) and the mastered count together, no full ranking/sort
+    choice = None
+    mastered_count = 0
 
+    for w, p in rows:
         # CASE 1 → New word, never attempted
         if not p:
-            ranked.append({
-                "word": w.text,
-                "priority": 0.1,
-                "reason": "not_attempted",
-                "score": None,
-                "attempts": 0,
-            })
+            priority = 0.1
+            if choice is None or priority < choice["priority"]:
+                choice = {
+                    "word": w.text,
+                    "priority": priority,
+                    "reason": "not_attempted",
+                    "score": None,
+                    "attempts": 0,
+                }
             continue
 
         # CASE 2 → Attempted, calculate weakness score
@@ -60,23 +59,21 @@ def get_next_adaptive_word(db: Session, user_id: int, level: str):
         weighted_score = base + penalty + avg
 
         # mastered words pushed down
-        if p.mastered == "yes":
+        if p.mastered:
             weighted_score += 10
+            mastered_count += 1
 
-        ranked.append({
-            "word": w.text,
-            "priority": weighted_score,
-            "reason": "weak" if p.score < 60 else "medium",
-            "score": p.score,
-            "attempts": p.attempts,
-        })
-
-    # 4) Sort by priority ASC (lower means more urgent)
-    ranked_sorted = sorted(ranked, key=lambda x: x["priority"])
+        if choice is None or weighted_score < choice["priority"]:
+            choice = {
+                "word": w.text,
+                "priority": weighted_score,
+                "reason": "weak" if p.score < 60 else "medium",
+                "score": p.score,
+                "attempts": p.attempts,
+            }
 
-    # 5) Level completion check
-    mastered_count = sum(1 for p in progress_entries if p.mastered == "yes")
-    total = len(word_objs)
+    # 4) Level completion check
+    total = len(rows)
 
     if mastered_count >= MASTER_THRESHOLD / 100 * total:
         return {
@@ -87,9 +84,7 @@ def get_next_adaptive_word(db: Session, user_id: int, level: str):
             "message": f"You mastered {level} level!"
         }
 
-    # 6) Return top recommended word
-    choice = ranked_sorted[0]
-
+    # 5) Return top recommended word
     return {
         "status": "practice",
         "level": level,
@@ -1,89 +1,111 @@
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
 from app.utils.phonetics import get_phonetics_syllables
-from app.utils.tts_handler import get_or_generate_tts
-from app.database.connection import SessionLocal
+from app.utils.tts_handler import get_or_generate_tts, tts_path
 from app.models.word import Word
 from app.models.level import Level
 from app.models.level_word import LevelWord
 import json
 
 
-def process_text(text: str, rate: int = 105):
+def process_text(db, text: str, rate: int = 105, background_tasks=None):
     """
     Full pipeline:
       text → (word-wise)
       - phonemes + syllables
-      - tts
+      - tts (with background_tasks: scheduled after the response instead of
+        rendered inline; audio_url is known up front, audio_ready says
+        whether it can be fetched already)
       - visual boxes
-      - DB auto-store
+      - DB auto-store (one commit for the whole text)
     """
 
-    db = SessionLocal()
-
     words = text.split()
     phonemes_list = []
     visual_list = []
+    processed = {}
 
     for w in words:
         data = get_phonetics_syllables(w)
-
-        # Update DB
-        store_word(db, w, data)
+        processed.setdefault(w, data)
 
         phonemes_list.append(data["phonemes"])
         visual_list.append(
             [{"text": part} for part in data["syllables"]]
         )
 
-    db.close()
+    # Update DB: every word of the text in one statement
+    store_words(db, processed.items())
+    db.commit()
 
-    audio_url = get_or_generate_tts(text, rate=rate)
+    if background_tasks is None:
+        audio_path = get_or_generate_tts(text, rate=rate)
+        audio_ready = True
+    else:
+        audio_path, audio_ready = tts_path(text, rate=rate)
+        if not audio_ready:
+            background_tasks.add_task(get_or_generate_tts, text, rate=rate)
 
     return {
         "text": text,
         "phonemes": phonemes_list,
         "visual": visual_list,
-        "audio_url": audio_url
+        # root-relative, same form as /process/{word} and synthesize_audio
+        "audio_url": f"/{audio_path}",
+        "audio_ready": audio_ready,
     }
 
 
-def store_word(db, text: str, phonetic_data):
+def store_words(db, items):
     """
-    Store word phonetics + syllables into DB (if new).
+    Store phonetics + syllables for many (text, phonetic_data) pairs at once.
+    A single INSERT ... ON CONFLICT (text) DO NOTHING: words already in the
+    table are left untouched, no SELECT per word.
+    Not committed: the caller commits once for its whole unit of work.
     """
-    word = db.query(Word).filter(Word.text == text).first()
-
-    if word:
+    rows = [
+        {
+            "text": text,
+            "phonetics": " ".join(phonetic_data["phonemes"]),
+            "syllables": json.dumps(phonetic_data["syllables"]),
+        }
+        for text, phonetic_data in items
+    ]
+    if not rows:
         return
 
-    item = Word(
-        text=text,
-        phonetics=" ".join(phonetic_data["phonemes"]),
-        syllables=json.dumps(phonetic_data["syllables"]),
+    db.execute(
+        pg_insert(Word)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=["text"])
     )
 
-    db.add(item)
-    db.commit()
+
+def store_word(db, text: str, phonetic_data):
+    """
+    Store word phonetics + syllables into DB (if new).
+    Not committed: the caller commits once for its whole unit of work.
+    """
+    store_words(db, [(text, phonetic_data)])
 
 def ensure_level_word(db, level_name, word_text):
     level = db.query(Level).filter(Level.name == level_name).first()
     if not level:
         level = Level(name=level_name)
         db.add(level)
-        db.commit()
-        db.refresh(level)
+        # flush assigns level.id (INSERT ... RETURNING); committed below
+        db.flush()
 
     word = db.query(Word).filter(Word.text == word_text).first()
     if not word:
+        db.commit()
         return
 
-    link = db.query(LevelWord).filter(
-        LevelWord.level_id == level.id,
-        LevelWord.word_id == word.id
-    ).first()
-
-    if link:
-        return
-
-    link = LevelWord(level_id=level.id, word_id=word.id)
-    db.add(link)
+    # idempotent link: concurrent first requests for the same word can't both
+    # pass a SELECT and then trip unique_level_word on INSERT
+    db.execute(
+        pg_insert(LevelWord)
+        .values(level_id=level.id, word_id=word.id)
+        .on_conflict_do_nothing(index_elements=["level_id", "word_id"])
+    )
     db.commit()
@@ -5,10 +5,14 @@ User progress + adaptive recommendation.
 - get_user_progress
 - get_level_status
 - recommend_next_word
+- adaptive_next_word
 """
 
+from sqlalchemy import Numeric, and_, case, cast, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from datetime import datetime
+from itertools import groupby
 
 from app.models.progress import UserProgress
 from app.models.word import Word
@@ -23,56 +27,52 @@ MASTER_THRESHOLD = 80
 # ----------------------------------------------------
 def record_attempt(db: Session, user_id: int, word: str, score: float, time_spent: float = 0.0):
 
-    word_obj = db.query(Word).filter(Word.text == word).first()
-    if not word_obj:
+    word_id = db.query(Word.id).filter(Word.text == word).scalar()
+    if word_id is None:
         return {"error": "Word not found"}
 
-    progress = (
-        db.query(UserProgress)
-        .filter(UserProgress.user_id == user_id,
-                UserProgress.word_id == word_obj.id)
-        .first()
+    now = datetime.utcnow()
+    mastered = score >= MASTER_THRESHOLD
+
+    # one round trip: INSERT the first attempt, or on (user_id, word_id)
+    # conflict UPDATE from the stored values (user_progress.* = old row,
+    # so the streak compares against the previous score)
+    stmt = pg_insert(UserProgress).values(
+        user_id=user_id,
+        word_id=word_id,
+        score=score,
+        attempts=1,
+        mastered=mastered,
+        total_time=time_spent,
+        moving_avg_score=score,
+        streak_score=0,
+        penalty_score=0 if score >= 60 else 0.5,
+        last_attempt=now,
     )
-
-    if progress:
-        # streak
-        if score > progress.score:
-            progress.streak_score += 1
-        elif score < progress.score:
-            progress.streak_score -= 1
-
-        # moving avg
-        progress.moving_avg_score = round((progress.moving_avg_score + score) / 2, 2)
-
-        # penalty
-        if score < 60:
-            progress.penalty_score += 0.5
-        else:
-            progress.penalty_score = max(0, progress.penalty_score - 0.2)
-
-        progress.attempts += 1
-        progress.score = score
-        progress.mastered = "yes" if score >= MASTER_THRESHOLD else "no"
-        progress.total_time += time_spent
-        progress.last_attempt = datetime.utcnow()
-
-    else:
-        progress = UserProgress(
-            user_id=user_id,
-            word_id=word_obj.id,
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "word_id"],
+        set_=dict(
+            streak_score=UserProgress.streak_score + case(
+                (UserProgress.score < score, 1),
+                (UserProgress.score > score, -1),
+                else_=0,
+            ),
+            moving_avg_score=func.round(
+                cast((UserProgress.moving_avg_score + score) / 2, Numeric), 2
+            ),
+            penalty_score=(
+                UserProgress.penalty_score + 0.5 if score < 60
+                else case((UserProgress.penalty_score > 0.2, UserProgress.penalty_score - 0.2), else_=0.0)
+            ),
+            attempts=UserProgress.attempts + 1,
             score=score,
-            attempts=1,
-            mastered="yes" if score >= MASTER_THRESHOLD else "no",
-            total_time=time_spent,
-            moving_avg_score=score,
-            streak_score=0,
-            penalty_score=0 if score >= 60 else 0.5,
-            last_attempt=datetime.utcnow(),
-        )
-        db.add(progress)
-
+            mastered=mastered,
+            total_time=UserProgress.total_time + time_spent,
+            last_attempt=now,
+        ),
+    )
+    db.execute(stmt)
     db.commit()
-    db.refresh(progress)
 
     return {"message": "Attempt recorded", "word": word, "score": score}
 
@@ -82,17 +82,24 @@ def record_attempt(db: Session, user_id: int, word: str, score: float, time_spen
 # ----------------------------------------------------
 def get_user_progress(db: Session, user_id: int):
 
-    entries = db.query(UserProgress).filter(UserProgress.user_id == user_id).all()
+    # word text joined in the same query (no lazy p.word load per row)
+    entries = (
+        db.query(UserProgress, Word.text)
+        .join(Word, Word.id == UserProgress.word_id)
+        .filter(UserProgress.user_id == user_id)
+        .all()
+    )
     if not entries:
         return {"message": "No progress found", "progress": []}
 
     summary = []
-    for p in entries:
+    for p, word_text in entries:
         summary.append({
-            "word": p.word.text,
+            "word": word_text,
             "score": round(p.score, 2),
             "attempts": p.attempts,
-            "mastered": p.mastered,
+            # response keeps the original "yes"/"no" contract
+            "mastered": "yes" if p.mastered else "no",
             "last_attempt": p.last_attempt,
             "moving_avg_score": p.moving_avg_score,
             "streak_score": p.streak_score,
@@ -107,41 +114,40 @@ def get_user_progress(db: Session, user_id: int):
 # ----------------------------------------------------
 def get_level_status(db: Session, user_id: int, level_name: str):
 
-    level = db.query(Level).filter(Level.name == level_name).first()
-    if not level:
-        return {"error": "Level not found"}
-
-    level_links = db.query(LevelWord).filter(LevelWord.level_id == level.id).all()
-    word_ids = [lw.word_id for lw in level_links]
-
-    words = db.query(Word).filter(Word.id.in_(word_ids)).all()
-    progress_entries = (
-        db.query(UserProgress)
-        .filter(UserProgress.user_id == user_id,
-                UserProgress.word_id.in_(word_ids))
+    # level -> its words -> this user's progress, one query; only the three
+    # columns we read, as plain rows. No rows = unknown level; a single row
+    # with text None = level exists but has no words yet.
+    rows = (
+        db.query(Word.text, UserProgress.score, UserProgress.attempts)
+        .select_from(Level)
+        .outerjoin(LevelWord, LevelWord.level_id == Level.id)
+        .outerjoin(Word, Word.id == LevelWord.word_id)
+        .outerjoin(UserProgress, and_(UserProgress.word_id == Word.id,
+                                      UserProgress.user_id == user_id))
+        .filter(Level.name == level_name)
         .all()
     )
+    if not rows:
+        return {"error": "Level not found"}
+    rows = [r for r in rows if r.text is not None]
 
-    progress_map = {p.word_id: p for p in progress_entries}
-
-    total_words = len(words)
+    total_words = len(rows)
     mastered = in_progress = not_started = 0
     result_list = []
 
-    for w in words:
-        p = progress_map.get(w.id)
-        if not p:
+    for text, raw_score, raw_attempts in rows:
+        if raw_score is None:
             status = "not_started"
             not_started += 1
             score = None
             attempts = 0
         else:
-            score = round(p.score, 2)
-            attempts = p.attempts
-            if p.score >= MASTER_THRESHOLD:
+            score = round(raw_score, 2)
+            attempts = raw_attempts
+            if raw_score >= MASTER_THRESHOLD:
                 status = "mastered"
                 mastered += 1
-            elif p.attempts > 0:
+            elif raw_attempts > 0:
                 status = "in_progress"
                 in_progress += 1
             else:
@@ -149,7 +155,7 @@ def get_level_status(db: Session, user_id: int, level_name: str):
                 not_started += 1
 
         result_list.append({
-            "word": w.text,
+            "word": text,
             "status": status,
             "score": score,
             "attempts": attempts
@@ -173,53 +179,100 @@ def get_level_status(db: Session, user_id: int, level_name: str):
 # ----------------------------------------------------
 def recommend_next_word(db: Session, user_id: int):
 
-    levels = db.query(Level).order_by(Level.id.asc()).all()
-
-    for level in levels:
-        links = db.query(LevelWord).filter(LevelWord.level_id == level.id).all()
-        word_ids = [l.word_id for l in links]
-
-        words = db.query(Word).filter(Word.id.in_(word_ids)).all()
-        progress_entries = (
-            db.query(UserProgress)
-            .filter(UserProgress.user_id == user_id,
-                    UserProgress.word_id.in_(word_ids))
-            .all()
-        )
-
-        progress_map = {p.word_id: p for p in progress_entries}
+    # every level word with this user's score (None = never attempted), one query
+    rows = (
+        db.query(Level.id, Level.name, Word.text, UserProgress.score)
+        .join(LevelWord, LevelWord.level_id == Level.id)
+        .join(Word, Word.id == LevelWord.word_id)
+        .outerjoin(UserProgress, and_(UserProgress.word_id == Word.id,
+                                      UserProgress.user_id == user_id))
+        .order_by(Level.id.asc(), Word.id.asc())
+        .all()
+    )
 
-        not_attempted = [w for w in words if w.id not in progress_map]
-        unmastered = [w for w in words if w.id in progress_map and progress_map[w.id].score < MASTER_THRESHOLD]
-        mastered = [w for w in words if w.id in progress_map and progress_map[w.id].score >= MASTER_THRESHOLD]
+    for _, level_rows in groupby(rows, key=lambda r: r.id):
+        # one pass: first never-attempted word, weakest unmastered word,
+        # and whether every word is mastered
+        first_new = None
+        worst = None
+        all_mastered = True
+
+        for w in level_rows:
+            if w.score is None:
+                all_mastered = False
+                if first_new is None:
+                    first_new = w
+            elif w.score < MASTER_THRESHOLD:
+                all_mastered = False
+                if worst is None or w.score < worst.score:
+                    worst = w
 
         # Must finish current level before moving
-        if len(mastered) < len(words):
+        if not all_mastered:
 
-            if not_attempted:
+            if first_new is not None:
                 return {
-                    "level": level.name,
-                    "recommend": not_attempted[0].text,
+                    "level": first_new.name,
+                    "recommend": first_new.text,
                     "reason": "New word not attempted yet"
                 }
 
-            if unmastered:
-                unmastered.sort(key=lambda w: progress_map[w.id].score)
-                worst = unmastered[0]
-                return {
-                    "level": level.name,
-                    "recommend": worst.text,
-                    "reason": "Lowest performing word",
-                    "score": progress_map[worst.id].score
-                }
+            return {
+                "level": worst.name,
+                "recommend": worst.text,
+                "reason": "Lowest performing word",
+                "score": worst.score
+            }
 
     return {"message": "All levels mastered!"}
 
 def adaptive_next_word(db: Session, user_id: int, level_name: str):
-    # 1) Fetch level words
-    level = db.query(Level).filter(Level.name == level_name).first()
-    if not level:
+    # 1) level words + this user's scores in one query (score None = never
+    #    attempted); no rows = unknown level, text None = level has no words
+    rows = (
+        db.query(Word.text, UserProgress.score)
+        .select_from(Level)
+        .outerjoin(LevelWord, LevelWord.level_id == Level.id)
+        .outerjoin(Word, Word.id == LevelWord.word_id)
+        .outerjoin(UserProgress, and_(UserProgress.word_id == Word.id,
+                                      UserProgress.user_id == user_id))
+        .filter(Level.name == level_name)
+        .order_by(Word.id.asc())
+        .all()
+    )
+    if not rows:
         return {"error": "Level not found"}
-
-    level_links = db.query(LevelWord).filter(LevelWord.level_id == level.id).all()
-    level_words = [db.query(Word).filter(Word.id == lw.word_id).first().text for lw in level_links]     
\ No newline at end of file
+    rows = [r for r in rows if r.text is not None]
+    if not rows:
+        # level exists but has no words linked: nothing to practise, and
+        # certainly nothing mastered
+        return {"error": "No words found in this level"}
+
+    # 2) one pass: first new word, else the weakest unmastered one
+    first_new = None
+    worst = None
+
+    for w in rows:
+        if w.score is None:
+            if first_new is None:
+                first_new = w
+        elif w.score < MASTER_THRESHOLD:
+            if worst is None or w.score < worst.score:
+                worst = w
+
+    if first_new is not None:
+        return {
+            "level": level_name,
+            "recommend": first_new.text,
+            "reason": "New word not attempted yet"
+        }
+
+    if worst is not None:
+        return {
+            "level": level_name,
+            "recommend": worst.text,
+            "reason": "Lowest performing word",
+            "score": worst.score
+        }
+
+    return {"level": level_name, "message": "Level mastered!"}
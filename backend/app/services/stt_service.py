@@ -2,7 +2,7 @@
 """
 Speech-to-text + scoring service (Vosk-based).
 
-- converts any uploaded audio to 16kHz mono WAV
+- decodes any uploaded audio to 16kHz mono PCM (streamed from ffmpeg)
 - runs Vosk ASR
 - computes:
     - overall similarity between expected sentence and recognized sentence
@@ -11,13 +11,17 @@ Speech-to-text + scoring service (Vosk-based).
 """
 
 import os
+import subprocess
 import tempfile
-import json
-from difflib import SequenceMatcher
+import threading
+
+import orjson
 from pathlib import Path
 import pathlib
-from typing import Tuple, List, Dict, Optional
+from typing import Iterable, Iterator, Tuple, List, Dict, Optional
 
+from rapidfuzz.distance import Levenshtein
+from rapidfuzz.fuzz import ratio
 from vosk import Model, KaldiRecognizer
 
 from app.database.connection import SessionLocal
@@ -37,42 +41,94 @@ if not Path(VOSK_MODEL_PATH).is_dir():
 VOSK_MODEL = Model(VOSK_MODEL_PATH)
 
 
-def _to_wav_mono_16k(in_path: str, out_path: str) -> None:
+PCM_CHUNK_BYTES = 4000
+
+
+def _pcm_chunks_mono_16k(in_path: str) -> Iterator[bytes]:
     """
-    Convert any audio file to WAV 16k mono PCM using pydub (ffmpeg must be installed).
-    pydub is imported lazily so ffmpeg path can be configured in main app before use.
+    Decode any audio file with ffmpeg and yield raw 16k mono 16-bit PCM in
+    PCM_CHUNK_BYTES pieces as ffmpeg produces them (ffmpeg must be installed;
+    FFMPEG_BINARY is resolved by app.main at startup). Nothing is written to
+    disk and the decoded audio is never held in memory as a whole.
     """
+    cmd = [
+        os.getenv("FFMPEG_BINARY", "ffmpeg"),
+        "-nostdin", "-loglevel", "error",
+        "-i", in_path,
+        "-ar", "16000", "-ac", "1", "-f", "s16le", "-",
+    ]
+    # stderr goes to an unbounded temp file, not a pipe: a corrupt upload can
+    # log an error per bad frame, and a full stderr pipe would block ffmpeg
+    # before it closes stdout, hanging the read loop below forever
+    stderr_file = tempfile.TemporaryFile()
     try:
-        from pydub import AudioSegment
-    except Exception as e:
-        raise RuntimeError("pydub is required to convert audio. Install ffmpeg and pydub. Error: " + str(e))
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file)
+    except FileNotFoundError as e:
+        stderr_file.close()
+        raise RuntimeError("ffmpeg is required to convert audio. Install ffmpeg or set FFMPEG_PATH. Error: " + str(e))
 
-    audio = AudioSegment.from_file(in_path)
-    audio = audio.set_frame_rate(16000).set_channels(1).set_sample_width(2)
-    audio.export(out_path, format="wav")
+    try:
+        while True:
+            chunk = proc.stdout.read(PCM_CHUNK_BYTES)
+            if not chunk:
+                break
+            yield chunk
+        if proc.wait() != 0:
+            stderr_file.seek(0)
+            # the first errors say why; don't echo megabytes of repeats
+            stderr = stderr_file.read(4096)
+            raise RuntimeError("ffmpeg failed to decode audio: " + stderr.decode(errors="replace").strip())
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        proc.stdout.close()
+        stderr_file.close()
+
+
+_tls = threading.local()
+
+
+def _get_recognizer() -> KaldiRecognizer:
+    """
+    One KaldiRecognizer per worker thread, built on first use and reused
+    (recognizers are not thread-safe, and construction allocates decoder state).
+    """
+    rec = getattr(_tls, "rec", None)
+    if rec is None:
+        rec = KaldiRecognizer(VOSK_MODEL, 16000)
+        rec.SetWords(True)
+        _tls.rec = rec
+    return rec
 
 
-def _vosk_recognize(wav_path: str) -> Tuple[str, Optional[float]]:
+def _vosk_recognize(pcm_chunks: Iterable[bytes]) -> Tuple[str, Optional[float]]:
     """
-    Run Vosk recognition and return (recognized_text, avg_confidence_or_None).
+    Run Vosk recognition over a stream of raw 16k mono PCM chunks and return
+    (recognized_text, avg_confidence_or_None).
     """
-    rec = KaldiRecognizer(VOSK_MODEL, 16000)
-    rec.SetWords(True)
+    rec = _get_recognizer()
 
     results = []
-    with open(wav_path, "rb") as fh:
-        # skip WAV header
-        fh.read(44)
-        while True:
-            data = fh.read(4000)
-            if not data:
-                break
-            if rec.AcceptWaveform(data):
-                res = json.loads(rec.Result())
+    try:
+        for chunk in pcm_chunks:
+            if rec.AcceptWaveform(chunk):
+                res = orjson.loads(rec.Result())
                 results.append(res)
-        final = json.loads(rec.FinalResult())
+        final = orjson.loads(rec.FinalResult())
         results.append(final)
+    finally:
+        # leave the reused recognizer clean for this thread's next request
+        rec.Reset()
 
+    return _merge_results(results)
+
+
+def _merge_results(results: List[dict]) -> Tuple[str, Optional[float]]:
+    """
+    Join Vosk Result()/FinalResult() segments into
+    (recognized_text, avg_confidence_or_None).
+    """
     text_parts: List[str] = []
     confidences: List[float] = []
     for r in results:
@@ -90,14 +146,44 @@ def _vosk_recognize(wav_path: str) -> Tuple[str, Optional[float]]:
     return recognized, avg_conf
 
 
+class StreamingRecognition:
+    """
+    Incremental recognition for one live audio stream (speech WebSocket).
+
+    Owns its own KaldiRecognizer: a connection's chunks may be processed on
+    different threadpool threads, so the thread-local one can't be used.
+    Calls must not overlap; feed one chunk at a time.
+    """
+
+    def __init__(self):
+        self._rec = KaldiRecognizer(VOSK_MODEL, 16000)
+        self._rec.SetWords(True)
+        self._results: List[dict] = []
+
+    def feed(self, pcm_chunk: bytes) -> Dict[str, str]:
+        """
+        Push raw 16k mono PCM. Returns {"text": ...} when Vosk closed a segment,
+        otherwise {"partial": ...} with the current partial hypothesis.
+        """
+        if self._rec.AcceptWaveform(pcm_chunk):
+            res = orjson.loads(self._rec.Result())
+            self._results.append(res)
+            return {"text": res.get("text", "")}
+        return {"partial": orjson.loads(self._rec.PartialResult()).get("partial", "")}
+
+    def finish(self) -> Tuple[str, Optional[float]]:
+        """Flush the recognizer and return (recognized_text, avg_confidence_or_None)."""
+        self._results.append(orjson.loads(self._rec.FinalResult()))
+        return _merge_results(self._results)
+
+
 def simple_similarity_score(expected: str, spoken: str) -> float:
     """
     Simple string similarity (0–100).
     """
     if not spoken:
         return 0.0
-    sm = SequenceMatcher(None, expected.lower().strip(), spoken.lower().strip())
-    return round(sm.ratio() * 100, 2)
+    return round(ratio(expected.lower().strip(), spoken.lower().strip()), 2)
 
 
 def compare_words(expected: str, spoken: str) -> Tuple[float, Optional[str]]:
@@ -105,17 +191,18 @@ def compare_words(expected: str, spoken: str) -> Tuple[float, Optional[str]]:
     Compare two words and return (score 0–100, mistake_type or None).
     mistake_type ∈ {None, "near_miss", "missing_word", "extra_pronunciation", "mispronounced"}
     """
-    expected_clean = expected.lower().strip()
-    spoken_clean = spoken.lower().strip()
+    return _compare_clean(expected.lower().strip(), spoken.lower().strip())
+
 
+def _compare_clean(expected_clean: str, spoken_clean: str) -> Tuple[float, Optional[str]]:
+    """compare_words() for tokens that are already lowercased and stripped."""
     if expected_clean == spoken_clean:
         return 100.0, None
 
     if not spoken_clean:
         return 0.0, "missing_word"
 
-    sm = SequenceMatcher(None, expected_clean, spoken_clean)
-    score = round(sm.ratio() * 100, 2)
+    score = round(ratio(expected_clean, spoken_clean), 2)
 
     if score > 80:
         mistake = None
@@ -129,27 +216,48 @@ def compare_words(expected: str, spoken: str) -> Tuple[float, Optional[str]]:
     return score, mistake
 
 
+# punctuation stripped from the expected sentence before word alignment
+_DROP_PUNCT = str.maketrans("", "", "?!")
+
+
 def _word_level_analysis(expected_sentence: str, recognized_sentence: str) -> Dict[str, any]:
     """
     Break down expected vs recognized at word level.
     """
-    expected_words = [w for w in expected_sentence.replace("?", "").replace("!", "").split() if w]
-    recognized_words = [w for w in recognized_sentence.split() if w]
-
+    # split() already drops empty tokens and surrounding whitespace; lowercase
+    # once per sentence instead of once per word pair
+    expected_sentence = expected_sentence.translate(_DROP_PUNCT)
+    expected_words = expected_sentence.split()
+    recognized_words = recognized_sentence.split()
+    expected_clean = expected_sentence.lower().split()
+    recognized_clean = recognized_sentence.lower().split()
+
+    # align on whole tokens (one Levenshtein pass in C) so a dropped or extra
+    # word doesn't shift every following pair; unmatched words are paired
+    # with "" and come out as missing_word / extra_pronunciation
     word_analysis = []
-    max_len = max(len(expected_words), len(recognized_words))
-    for i in range(max_len):
-        exp = expected_words[i] if i < len(expected_words) else ""
-        rec = recognized_words[i] if i < len(recognized_words) else ""
-        w_score, mistake = compare_words(exp, rec)
-        word_analysis.append(
-            {
-                "expected": exp,
-                "spoken": rec,
-                "word_score": w_score,
-                "mistake": mistake,
-            }
-        )
+    for op in Levenshtein.opcodes(expected_clean, recognized_clean):
+        span = max(op.src_end - op.src_start, op.dest_end - op.dest_start)
+        for k in range(span):
+            i = op.src_start + k
+            j = op.dest_start + k
+            if i < op.src_end:
+                exp, exp_clean = expected_words[i], expected_clean[i]
+            else:
+                exp = exp_clean = ""
+            if j < op.dest_end:
+                rec, rec_clean = recognized_words[j], recognized_clean[j]
+            else:
+                rec = rec_clean = ""
+            w_score, mistake = _compare_clean(exp_clean, rec_clean)
+            word_analysis.append(
+                {
+                    "expected": exp,
+                    "spoken": rec,
+                    "word_score": w_score,
+                    "mistake": mistake,
+                }
+            )
 
     avg_word_score = (
         round(sum(w["word_score"] for w in word_analysis) / len(word_analysis), 2)
@@ -170,59 +278,64 @@ def analyze_audio_file(
     Orchestrator used by the speech route.
 
     Steps:
-    - Convert uploaded file to temp WAV (16k mono)
-    - Run Vosk to get recognized text + confidence
+    - Stream the uploaded file through ffmpeg as 16k mono PCM into Vosk
+      to get recognized text + confidence
     - Compute:
         - overall_similarity_percent (sentence-level)
         - word_level: avg_word_score + per-word breakdown
     - Record attempt via record_attempt (if user_id provided)
     """
-    tmp_wav = None
-    try:
-        # create temp wav path
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-            tmp_wav = tmp.name
-
-        # convert -> wav
-        _to_wav_mono_16k(file_path, tmp_wav)
-
-        # recognize
-        recognized, confidence = _vosk_recognize(tmp_wav)
-
-        # overall similarity (string-level)
-        overall_similarity = simple_similarity_score(expected_word, recognized)
-
-        # word-level details
-        word_analysis_res = _word_level_analysis(expected_word, recognized)
-
-        result = {
-            "expected": expected_word,
-            "recognized": recognized,
-            "confidence": confidence,
-            "overall_similarity_percent": overall_similarity,
-            "word_level": word_analysis_res,
-        }
-
-        # persist attempt if user_id is known
-        if record and user_id:
-            db = SessionLocal()
-            try:
-                # using avg word score as the attempt score
-                record_attempt(
-                    db,
-                    user_id=user_id,
-                    word=expected_word,  # record_attempt will map sentence -> word if needed
-                    score=word_analysis_res["avg_word_score"],
-                    time_spent=0.0,  # frontend can send real value later
-                )
-            finally:
-                db.close()
-
-        return result
+    # decode -> 16k mono PCM streamed from ffmpeg straight into Vosk
+    recognized, confidence = _vosk_recognize(_pcm_chunks_mono_16k(file_path))
+
+    result = score_recognition(expected_word, recognized, confidence)
+
+    # persist attempt if user_id is known (the speech route passes record=False
+    # and schedules save_attempt as a background task instead)
+    if record and user_id:
+        save_attempt(user_id, expected_word, result["word_level"]["avg_word_score"])
+
+    return result
+
 
+def score_recognition(
+    expected_word: str,
+    recognized: str,
+    confidence: Optional[float],
+) -> Dict[str, any]:
+    """
+    Score recognized text against the expected sentence/word:
+    overall_similarity_percent + word_level breakdown.
+    """
+    # overall similarity (string-level)
+    overall_similarity = simple_similarity_score(expected_word, recognized)
+
+    # word-level details
+    word_analysis_res = _word_level_analysis(expected_word, recognized)
+
+    return {
+        "expected": expected_word,
+        "recognized": recognized,
+        "confidence": confidence,
+        "overall_similarity_percent": overall_similarity,
+        "word_level": word_analysis_res,
+    }
+
+
+def save_attempt(user_id: int, expected_word: str, score: float) -> None:
+    """
+    Persist one analyzed attempt in its own session.
+    Safe to run after the response is sent (FastAPI BackgroundTasks).
+    """
+    db = SessionLocal()
+    try:
+        # using avg word score as the attempt score
+        record_attempt(
+            db,
+            user_id=user_id,
+            word=expected_word,  # record_attempt will map sentence -> word if needed
+            score=score,
+            time_spent=0.0,  # frontend can send real value later
+        )
     finally:
-        if tmp_wav and os.path.exists(tmp_wav):
-            try:
-                os.remove(tmp_wav)
-            except Exception:
-                pass
+        db.close()
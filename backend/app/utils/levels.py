@@ -1,8 +1,10 @@
 import json
 import os
+from functools import lru_cache
 from pathlib import Path
+from sqlalchemy import insert
 from app.utils.phonetics import get_phonetics_syllables
-from app.services.learning_service import store_word, ensure_level_word
+from app.utils.tts_handler import generate_tts_many
 from app.database.connection import SessionLocal
 from app.models.level import Level
 from app.models.word import Word
@@ -11,13 +13,24 @@ from app.models.level_word import LevelWord
 LEVELS_PATH = "app/data/levels.json"
 
 
+@lru_cache(maxsize=1)
+def _load_levels_cached(mtime: float):
+    with open(LEVELS_PATH, "r") as f:
+        return json.load(f)
+
+
 # ✅ Load levels from JSON file (used by API endpoints)
 def load_levels():
-    """Load the predefined level structure from levels.json."""
-    if not os.path.exists(LEVELS_PATH):
+    """
+    Load the predefined level structure from levels.json.
+    Parsed once and reused until the file's mtime changes; callers must
+    treat the result as read-only.
+    """
+    try:
+        mtime = os.path.getmtime(LEVELS_PATH)
+    except OSError:
         return {}
-    with open(LEVELS_PATH, "r") as f:
-        return json.load(f)
+    return _load_levels_cached(mtime)
 
 
 # ✅ Retrieve all words under a level (from JSON)
@@ -28,54 +41,82 @@ def get_words_for_level(level: str):
 
 
 # ✅ Sync levels.json into the database
-def sync_levels_to_db():
+def sync_levels_to_db(pregenerate_audio: bool = True):
     """
     Sync levels.json → PostgreSQL.
     Creates missing Levels, Words, and their relations (LevelWord).
+    With pregenerate_audio, also renders every level word's TTS at the default
+    rate so /process/{word} finds it in the audio cache.
     """
     if not Path(LEVELS_PATH).exists():
         return {"error": "levels.json not found"}
 
     data = load_levels()
     db = SessionLocal()
-    created_levels = 0
-    created_links = 0
-    skipped = 0
-
-    for level_name, words in data.items():
-        # Check if the level already exists
-        level = db.query(Level).filter_by(name=level_name).first()
-        if not level:
-            level = Level(name=level_name)
-            db.add(level)
-            db.commit()
-            db.refresh(level)
-            created_levels += 1
+    try:
+        # 1) Levels: one SELECT for the known ones, one multi-row INSERT for the rest
+        level_ids = dict(
+            db.query(Level.name, Level.id).filter(Level.name.in_(list(data))).all()
+        )
+        missing_levels = [name for name in data if name not in level_ids]
+        if missing_levels:
+            db.execute(insert(Level), [{"name": name} for name in missing_levels])
+            level_ids.update(
+                db.query(Level.name, Level.id).filter(Level.name.in_(missing_levels)).all()
+            )
+        created_levels = len(missing_levels)
 
-        # Loop through words in the level
-        for word_text in words:
-            # Ensure the word exists (store if missing)
-            word_data = get_phonetics_syllables(word_text)
-            store_word(db, word_text, word_data)
+        # 2) Words: same pattern, phonetics computed only for new words
+        all_words = list(dict.fromkeys(w for words in data.values() for w in words))
+        word_ids = dict(
+            db.query(Word.text, Word.id).filter(Word.text.in_(all_words)).all()
+        )
+        missing_words = [w for w in all_words if w not in word_ids]
+        if missing_words:
+            rows = []
+            for word_text in missing_words:
+                word_data = get_phonetics_syllables(word_text)
+                rows.append({
+                    "text": word_text,
+                    "phonetics": " ".join(word_data["phonemes"]),
+                    "syllables": json.dumps(word_data["syllables"]),
+                })
+            db.execute(insert(Word), rows)
+            word_ids.update(
+                db.query(Word.text, Word.id).filter(Word.text.in_(missing_words)).all()
+            )
 
-            # Get the word object
-            word = db.query(Word).filter_by(text=word_text).first()
-            if not word:
-                skipped += 1
-                continue
+        # 3) Links: diff against the existing pairs, insert the rest in one go
+        existing_links = set(
+            db.query(LevelWord.level_id, LevelWord.word_id)
+            .filter(LevelWord.level_id.in_(list(level_ids.values())))
+            .all()
+        )
+        new_links = []
+        skipped = 0
+        for level_name, words in data.items():
+            level_id = level_ids[level_name]
+            for word_text in words:
+                word_id = word_ids.get(word_text)
+                if word_id is None:
+                    skipped += 1
+                    continue
+                pair = (level_id, word_id)
+                if pair not in existing_links:
+                    existing_links.add(pair)
+                    new_links.append({"level_id": level_id, "word_id": word_id})
+        if new_links:
+            db.execute(insert(LevelWord), new_links)
+        created_links = len(new_links)
 
-            # Create level-word link if not exists
-            link = (
-                db.query(LevelWord)
-                .filter_by(level_id=level.id, word_id=word.id)
-                .first()
-            )
-            if not link:
-                db.add(LevelWord(level_id=level.id, word_id=word.id))
-                created_links += 1
+        db.commit()
+    finally:
+        db.close()
 
-    db.commit()
-    db.close()
+    # one engine run for every uncached word (pyttsx3 is single-threaded,
+    # batching is what amortizes it); cached words are an exists() check
+    if pregenerate_audio:
+        generate_tts_many(all_words)
 
     return {
         "message": "Levels synced successfully.",
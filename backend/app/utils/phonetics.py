@@ -1,14 +1,18 @@
+from functools import lru_cache
+
 import pronouncing
 
-def get_phonetics_syllables(word: str):
-    phones = pronouncing.phones_for_word(word.lower())
+
+@lru_cache(maxsize=20000)
+def _arpabet_syllables(word_lower: str):
+    """
+    CMUdict phonemes + syllable split for a lowercased word, memoized.
+    Returns (phonemes, syllables) as tuples, or None if the word is unknown.
+    """
+    phones = pronouncing.phones_for_word(word_lower)
 
     if not phones:
-        return {
-            "word": word,
-            "syllables": [word],
-            "phonemes": [word],    
-        }
+        return None
 
     arpabet = phones[0]
     phoneme_list = arpabet.split()
@@ -18,15 +22,31 @@ def get_phonetics_syllables(word: str):
 
     for p in phoneme_list:
         current.append(p)
-        if any(x.isdigit() for x in p):
+        # ARPAbet marks vowels with a trailing stress digit (AH0, EH1, ...)
+        if p[-1].isdigit():
             syllables.append(" ".join(current))
             current = []
 
     if current:
         syllables.append(" ".join(current))
 
+    return tuple(phoneme_list), tuple(syllables)
+
+
+def get_phonetics_syllables(word: str):
+    cached = _arpabet_syllables(word.lower())
+
+    if cached is None:
+        return {
+            "word": word,
+            "syllables": [word],
+            "phonemes": [word],
+        }
+
+    # fresh lists per call so callers never mutate the cached entry
+    phonemes, syllables = cached
     return {
         "word": word,
-        "syllables": syllables,
-        "phonemes": phoneme_list
+        "syllables": list(syllables),
+        "phonemes": list(phonemes)
     }
@@ -1,46 +1,127 @@
+import hashlib
 import os
-import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import pyttsx3
 
+# one speech engine per process, created on first use and only ever touched
+# from this single worker thread: pyttsx3 is not thread-safe, and the
+# SAPI5 (COM) / NSSpeech drivers are bound to the thread that created them
+_engine = None
+_tts_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts")
+
+
+def _audio_path(text: str, audio_dir: str, rate: int) -> Path:
+    """
+    Content-addressed location for a phrase: same text + rate -> same file.
+    """
+    key = hashlib.sha1(f"{rate}:{text.strip().lower()}".encode("utf-8")).hexdigest()
+    return Path(audio_dir) / f"{key}.mp3"
+
+def _get_engine():
+    """Process-wide pyttsx3 engine (TTS worker thread only)."""
+    global _engine
+    if _engine is None:
+        _engine = pyttsx3.init()
+        voices = _engine.getProperty("voices")
+        _engine.setProperty("voice", voices[0].id)
+    return _engine
+
+def _render_missing(items, audio_dir: str, rate: int) -> None:
+    """
+    Runs on the TTS worker thread: render the (text, out_path) pairs whose
+    file doesn't exist yet in one engine run. Re-checked here because an
+    earlier queued job may already have rendered the same phrase.
+    """
+    missing = {}
+    for text, out_path in items:
+        if not out_path.exists():
+            missing.setdefault(out_path, text)
+    if not missing:
+        return
+
+    # only a miss needs the directory; cache hits are one stat()
+    Path(audio_dir).mkdir(parents=True, exist_ok=True)
+    engine = _get_engine()
+    engine.setProperty("rate", rate)  # slower for clarity
+    _synthesize(engine, [(text, out_path) for out_path, text in missing.items()])
+
+def _synthesize(engine, items) -> None:
+    """
+    Render (text, out_path) pairs in one engine run. Each file is written to
+    a temp name in the same directory and os.replace()d onto out_path only
+    after runAndWait() succeeds, so the final name is never a partial file
+    (other callers treat "out_path exists" as a finished cache hit).
+    """
+    pending = []
+    try:
+        for text, out_path in items:
+            tmp_path = out_path.with_name(f".{out_path.stem}.{uuid.uuid4().hex}.tmp{out_path.suffix}")
+            pending.append((tmp_path, out_path))
+            engine.save_to_file(text, str(tmp_path))
+        engine.runAndWait()
+        for tmp_path, out_path in pending:
+            os.replace(tmp_path, out_path)
+    finally:
+        # leftovers only exist if rendering or a rename failed
+        for tmp_path, _ in pending:
+            try:
+                tmp_path.unlink()
+            except FileNotFoundError:
+                pass
+
+def _render(text: str, audio_dir: str, rate: int) -> Path:
+    """
+    Path of the rendered audio for text + rate, synthesizing it only if it
+    isn't on disk yet (no engine init for already-rendered phrases).
+    """
+    out_path = _audio_path(text, audio_dir, rate)
+    if out_path.exists():
+        return out_path
+
+    _tts_executor.submit(_render_missing, [(text, out_path)], audio_dir, rate).result()
+
+    return out_path
+
 def synthesize_audio(text: str, audio_dir: str = "static/audio", rate: int = 105):
     """
     Generate dyslexia-friendly audio for a phrase or sentence.
     - Offline, smooth, slower speech
     - Reads entire text naturally (multi-word)
+    - Reuses the file if this text + rate was already rendered
     """
-    Path(audio_dir).mkdir(parents=True, exist_ok=True)
-    safe_name = "".join(ch for ch in text if ch.isalnum() or ch in ('-', '_')).lower()
-    filename = f"{safe_name}_{int(time.time())}.mp3"
-    out_path = Path(audio_dir) / filename
-
-    engine = pyttsx3.init()
-    engine.setProperty("rate", rate)  # slower for clarity
-    voices = engine.getProperty("voices")
-    engine.setProperty("voice", voices[0].id)
+    return f"/{_render(text, audio_dir, rate).as_posix()}"
 
-    engine.save_to_file(text, str(out_path))
-    engine.runAndWait()
 
-    return f"/{out_path.as_posix()}"
+def tts_path(text: str, audio_dir: str = "static/audio", rate: int = 105):
+    """
+    (relative path, already rendered?) for text + rate without synthesizing;
+    the path is where get_or_generate_tts will put the audio. Files only
+    appear under that name once fully written, so exists() means ready.
+    """
+    path = _audio_path(text, audio_dir, rate)
+    return path.as_posix(), path.exists()
 
 
 def get_or_generate_tts(word: str, audio_dir: str = "static/audio", rate: int = 105):
     """
     Returns cached audio for a single word if available,
-    else generates new audio using synthesize_audio().
-    Ensures minimal regeneration + consistent behavior.
+    else generates new audio.
+    Always returns the relative path (no leading "/"), cached or not.
     """
-    Path(audio_dir).mkdir(parents=True, exist_ok=True)
+    return _render(word, audio_dir, rate).as_posix()
 
-    safe_name = "".join(ch for ch in word if ch.isalnum() or ch in ('-', '_')).lower()
-    existing_files = list(Path(audio_dir).glob(f"{safe_name}_*.mp3"))
 
-    if existing_files:
-        # return most recent
-        latest = sorted(existing_files, key=lambda p: p.stat().st_mtime, reverse=True)[0]
-        return latest.as_posix()
+def generate_tts_many(words, audio_dir: str = "static/audio", rate: int = 105):
+    """
+    Render every not-yet-cached word in one engine run: all save_to_file
+    calls are queued and a single runAndWait() drains them.
+    Returns the relative paths in input order, like get_or_generate_tts.
+    """
+    paths = [_audio_path(w, audio_dir, rate) for w in words]
+
+    if not all(path.exists() for path in paths):
+        _tts_executor.submit(_render_missing, list(zip(words, paths)), audio_dir, rate).result()
 
-    # generate fresh
-    audio_url = synthesize_audio(word, audio_dir=audio_dir, rate=rate)
-    return audio_url
+    return [path.as_posix() for path in paths]
@@ -1,8 +1,5 @@
-import pandas as pd
-import numpy as np
 import pickle
 import os
-import matplotlib.pyplot as plt
 
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
@@ -14,10 +11,12 @@ from sklearn.tree import DecisionTreeClassifier
 from sklearn.svm import SVC
 from sklearn.cluster import KMeans
 
+from utils import load_dataset
+
 # ============================
 # LOAD DATASET
 # ============================
-df = pd.read_excel("data/dyslexia_dataset_500.xlsx")
+df = load_dataset()
 
 X = df[["syllables","length","vowel_count","consonant_count",
         "confusing_letters","phonetic_complexity"]]
@@ -30,6 +29,12 @@ X_train, X_test, y_train, y_test = train_test_split(
     X, y, test_size=0.2, random_state=42
 )
 
+# Scale once: LR and SVM both train on the same split, so they share one
+# scaler fitted on X_train (K-means below is fitted on all of X)
+scaler = StandardScaler()
+X_train_scaled = scaler.fit_transform(X_train)
+X_test_scaled = scaler.transform(X_test)
+
 # Create report folder
 os.makedirs("model", exist_ok=True)
 os.makedirs("reports", exist_ok=True)
@@ -42,14 +47,10 @@ accuracies = {}
 # ============================
 print("\n===== TRAINING LOGISTIC REGRESSION =====")
 
-scaler_lr = StandardScaler()
-X_train_lr = scaler_lr.fit_transform(X_train)
-X_test_lr = scaler_lr.transform(X_test)
-
 lr = LogisticRegression(max_iter=500, multi_class="multinomial")
-lr.fit(X_train_lr, y_train)
+lr.fit(X_train_scaled, y_train)
 
-lr_pred = lr.predict(X_test_lr)
+lr_pred = lr.predict(X_test_scaled)
 lr_acc = accuracy_score(y_test, lr_pred)
 accuracies["Logistic Regression"] = lr_acc
 
@@ -57,7 +58,7 @@ print("Accuracy:", lr_acc)
 print(classification_report(y_test, lr_pred))
 
 with open("model/lr_model.pkl", "wb") as f:
-    pickle.dump((lr, scaler_lr), f)
+    pickle.dump((lr, scaler), f)
 
 report_text += f"Logistic Regression Accuracy: {lr_acc:.4f}\n"
 
@@ -67,7 +68,7 @@ report_text += f"Logistic Regression Accuracy: {lr_acc:.4f}\n"
 # ============================
 print("\n===== TRAINING RANDOM FOREST =====")
 
-rf = RandomForestClassifier(n_estimators=200, random_state=42)
+rf = RandomForestClassifier(n_estimators=200, random_state=42, n_jobs=-1)
 rf.fit(X_train, y_train)
 
 rf_pred = rf.predict(X_test)
@@ -88,14 +89,10 @@ report_text += f"Random Forest Accuracy: {rf_acc:.4f}\n"
 # ============================
 print("\n===== TRAINING SVM =====")
 
-scaler_svm = StandardScaler()
-X_train_svm = scaler_svm.fit_transform(X_train)
-X_test_svm = scaler_svm.transform(X_test)
+svm = SVC(kernel="rbf")
+svm.fit(X_train_scaled, y_train)
 
-svm = SVC(kernel="rbf", probability=True)
-svm.fit(X_train_svm, y_train)
-
-svm_pred = svm.predict(X_test_svm)
+svm_pred = svm.predict(X_test_scaled)
 svm_acc = accuracy_score(y_test, svm_pred)
 accuracies["SVM"] = svm_acc
 
@@ -103,7 +100,7 @@ print("Accuracy:", svm_acc)
 print(classification_report(y_test, svm_pred))
 
 with open("model/svm_model.pkl", "wb") as f:
-    pickle.dump((svm, scaler_svm), f)
+    pickle.dump((svm, scaler), f)
 
 report_text += f"SVM Accuracy: {svm_acc:.4f}\n"
 
@@ -169,6 +166,10 @@ print("\nReport saved → reports/model_report.txt")
 # ============================
 # ACCURACY GRAPH
 # ============================
+# imported here so training output starts without waiting on matplotlib's
+# font cache / backend probing
+import matplotlib.pyplot as plt
+
 plt.figure(figsize=(10,6))
 plt.bar(accuracies.keys(), accuracies.values(), color=["blue","green","red","orange","purple"])
 plt.title("Model Accuracy Comparison")
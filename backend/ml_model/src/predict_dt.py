@@ -8,6 +8,11 @@ def predict_difficulty_dt(features):
     result = dt.predict([features])[0]
     return {0:"easy", 1:"medium", 2:"hard"}[result]
 
+def predict_many_dt(rows):
+    """Labels for many feature rows with one predict call."""
+    results = dt.predict(np.asarray(rows, dtype=np.float64))
+    return [{0:"easy", 1:"medium", 2:"hard"}[r] for r in results]
+
 # Manual test
 if __name__ == "__main__":
     test_word = [1, 4, 2, 2, 0, 2]
@@ -9,6 +9,10 @@ def predict_cluster(features):
     cluster = kmeans.predict(features_scaled)[0]
     return cluster  # 0,1,2 cluster index
 
+def predict_many_kmeans(rows):
+    """Cluster index for many feature rows with one scaler + predict call."""
+    return kmeans.predict(scaler.transform(np.asarray(rows, dtype=np.float64)))
+
 if __name__ == "__main__":
     test_word = [1,4,2,2,0,1]
     print("Cluster:", predict_cluster(test_word))
@@ -4,6 +4,12 @@ import numpy as np
 # Load model + scaler
 model, scaler = pickle.load(open("model/difficulty_model_lr.pkl", "rb"))
 
+def predict_many_lr(rows):
+    """Labels for many feature rows with one scaler + predict call."""
+    arr = scaler.transform(np.asarray(rows, dtype=np.float64))
+    mapping = {0: "easy", 1: "medium", 2: "hard"}
+    return [mapping[p] for p in model.predict(arr)]
+
 def predict_difficulty(features):
     features_scaled = scaler.transform([features])
     pred = model.predict(features_scaled)[0]
@@ -5,6 +5,9 @@ import numpy as np
 with open("model/difficulty_model_rf.pkl", "rb") as f:
     rf_model = pickle.load(f)
 
+# trained with n_jobs=-1; a thread pool per single-row predict only adds overhead
+rf_model.set_params(n_jobs=1)
+
 def predict_difficulty_rf(features):
     """
     features = [syllables, length, vowel_count, consonant_count, confusing_letters, phonetic_complexity]
@@ -17,6 +20,16 @@ def predict_difficulty_rf(features):
     label_map = {0: "easy", 1: "medium", 2: "hard"}
     return label_map[prediction]
 
+def predict_many_rf(rows):
+    """
+    Labels for many feature rows with one predict call.
+    rows = list of [syllables, length, vowel_count, consonant_count, confusing_letters, phonetic_complexity]
+    """
+    predictions = rf_model.predict(np.asarray(rows, dtype=np.float64))
+
+    label_map = {0: "easy", 1: "medium", 2: "hard"}
+    return [label_map[p] for p in predictions]
+
 # Test the model manually
 if __name__ == "__main__":
     test_word = [1, 4, 2, 2, 0, 2]  # example features
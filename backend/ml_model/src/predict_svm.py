@@ -9,6 +9,11 @@ def predict_difficulty_svm(features):
     result = svm.predict(features_scaled)[0]
     return {0:"easy", 1:"medium", 2:"hard"}[result]
 
+def predict_many_svm(rows):
+    """Labels for many feature rows with one scaler + predict call."""
+    results = svm.predict(scaler.transform(np.asarray(rows, dtype=np.float64)))
+    return [{0:"easy", 1:"medium", 2:"hard"}[r] for r in results]
+
 # Manual test
 if __name__ == "__main__":
     test_word = [1, 4, 2, 2, 0, 2]
@@ -1,12 +1,13 @@
-import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.tree import DecisionTreeClassifier
 from sklearn.metrics import accuracy_score, confusion_matrix, classification_report
 import pickle
 import os
 
+from utils import load_dataset
+
 # Load dataset
-df = pd.read_excel("data/dyslexia_dataset_500.xlsx")
+df = load_dataset()
 
 # Features & labels
 X = df[["syllables","length","vowel_count","consonant_count",
@@ -1,13 +1,13 @@
-import pandas as pd
-import numpy as np
 from sklearn.preprocessing import StandardScaler
 from sklearn.cluster import KMeans
 from sklearn.metrics import adjusted_rand_score, homogeneity_score
 import pickle
 import os
 
+from utils import load_dataset
+
 # Load dataset
-df = pd.read_excel("data/dyslexia_dataset_500.xlsx")
+df = load_dataset()
 
 X = df[["syllables","length","vowel_count","consonant_count",
         "confusing_letters","phonetic_complexity"]]
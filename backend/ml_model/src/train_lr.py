@@ -1,5 +1,3 @@
-import pandas as pd
-import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 from sklearn.linear_model import LogisticRegression
@@ -7,8 +5,10 @@ from sklearn.metrics import accuracy_score, confusion_matrix, classification_rep
 import pickle
 import os
 
+from utils import load_dataset
+
 # Load dataset
-df = pd.read_excel("data/dyslexia_dataset_500.xlsx")
+df = load_dataset()
 
 # Extract features
 X = df[["syllables", "length", "vowel_count", "consonant_count",
@@ -1,12 +1,13 @@
-import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, confusion_matrix, classification_report
 from sklearn.ensemble import RandomForestClassifier
 import pickle
 import os
 
+from utils import load_dataset
+
 # Load dataset
-df = pd.read_excel("data/dyslexia_dataset_500.xlsx")
+df = load_dataset()
 
 # Features
 X = df[["syllables","length","vowel_count","consonant_count",
@@ -25,7 +26,8 @@ rf = RandomForestClassifier(
     n_estimators=200,
     random_state=42,
     max_depth=None,
-    criterion="gini"
+    criterion="gini",
+    n_jobs=-1,  # build the 200 trees on all cores
 )
 
 # Train
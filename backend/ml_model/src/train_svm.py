@@ -1,5 +1,3 @@
-import pandas as pd
-import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 from sklearn.svm import SVC
@@ -7,8 +5,10 @@ from sklearn.metrics import accuracy_score, confusion_matrix, classification_rep
 import pickle
 import os
 
+from utils import load_dataset
+
 # Load dataset
-df = pd.read_excel("data/dyslexia_dataset_500.xlsx")
+df = load_dataset()
 
 # Features
 X = df[["syllables","length","vowel_count","consonant_count",
@@ -28,7 +28,7 @@ X_train_scaled = scaler.fit_transform(X_train)
 X_test_scaled = scaler.transform(X_test)
 
 # Model
-svm = SVC(kernel="rbf", probability=True)
+svm = SVC(kernel="rbf")
 
 # Train
 svm.fit(X_train_scaled, y_train)
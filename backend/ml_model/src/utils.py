@@ -1,4 +1,27 @@
+import os
+
 import numpy as np
+import pandas as pd
+
+FEATURE_COLUMNS = ["syllables", "length", "vowel_count", "consonant_count",
+                   "confusing_letters", "phonetic_complexity"]
+
+DATASET_XLSX = "data/dyslexia_dataset_500.xlsx"
+# parsed copy of the xlsx; openpyxl parsing dominates every script's start-up
+DATASET_CACHE = "data/dyslexia_dataset_500.pkl"
+
+
+def load_dataset():
+    """
+    Load the training dataset as a DataFrame.
+    The xlsx is parsed once and cached as a pandas pickle next to it; the
+    cache is rebuilt whenever the xlsx is newer.
+    """
+    if (not os.path.exists(DATASET_CACHE)
+            or os.path.getmtime(DATASET_CACHE) < os.path.getmtime(DATASET_XLSX)):
+        pd.read_excel(DATASET_XLSX).to_pickle(DATASET_CACHE)
+    return pd.read_pickle(DATASET_CACHE)
+
 
 def extract_features(word_row):
     return np.array([
@@ -9,3 +32,11 @@ def extract_features(word_row):
         word_row["confusing_letters"],
         word_row["phonetic_complexity"],
     ])
+
+
+def extract_features_batch(df):
+    """
+    Feature matrix for a whole DataFrame in one shot (rows in df order,
+    columns in FEATURE_COLUMNS order, same as extract_features per row).
+    """
+    return df[FEATURE_COLUMNS].to_numpy(dtype=np.float64)
@@ -0,0 +1,15 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+
+# app.database.connection refuses to import without a URL; the route tests
+# here never touch the database (file-backed so the pool options apply)
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{Path(tempfile.gettempdir()) / 'learningmodule_tests.db'}"
+)
+sys.path.insert(0, str(BACKEND_ROOT))
+# levels.json and the Vosk model are resolved relative to the backend root
+os.chdir(BACKEND_ROOT)
@@ -0,0 +1,33 @@
+import orjson
+from fastapi.responses import ORJSONResponse
+
+from app.auth.auth_utils import create_access_token
+from app.routes.learning import get_level_words, list_levels
+from app.routes.users import get_me
+from app.utils.levels import load_levels
+
+
+def _body(response):
+    return orjson.loads(response.body)
+
+
+def test_list_levels_returns_orjson_response():
+    response = list_levels()
+
+    assert isinstance(response, ORJSONResponse)
+    assert _body(response) == {"levels": list(load_levels().keys())}
+
+
+def test_get_level_words_returns_orjson_response():
+    level = next(iter(load_levels()))
+    response = get_level_words(level)
+
+    assert isinstance(response, ORJSONResponse)
+    assert _body(response) == {"level": level, "words": load_levels()[level]}
+
+
+def test_get_me_returns_orjson_response():
+    response = get_me(create_access_token({"sub": "42"}))
+
+    assert isinstance(response, ORJSONResponse)
+    assert _body(response) == {"user_id": "42"}
@@ -0,0 +1,49 @@
+import asyncio
+
+import orjson
+import pytest
+
+pytest.importorskip("vosk")
+pytest.importorskip("multipart")
+
+from app.routes import speech
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.accepted = False
+        self.sent = []
+        self.close_code = None
+
+    async def accept(self):
+        self.accepted = True
+
+    async def send_text(self, data):
+        self.sent.append(orjson.loads(data))
+
+    async def close(self, code=1000):
+        self.close_code = code
+
+    async def receive(self):
+        raise AssertionError("a rejected stream must not read frames")
+
+
+def test_stream_rejected_when_all_slots_taken(monkeypatch):
+    def no_recognizer():
+        raise AssertionError("a rejected stream must not build a recognizer")
+
+    monkeypatch.setattr(speech, "StreamingRecognition", no_recognizer)
+
+    async def run():
+        # fresh semaphore on this test's loop, with every slot held
+        monkeypatch.setattr(speech, "_stream_slots", asyncio.Semaphore(1))
+        ws = FakeWebSocket()
+        async with speech._stream_slots:
+            await speech.speech_stream(ws, expected="hello", user_id=1)
+        return ws
+
+    ws = asyncio.run(run())
+
+    assert ws.accepted
+    assert ws.sent == [{"error": "Too many concurrent speech streams"}]
+    assert ws.close_code == speech.WS_TRY_AGAIN_LATER == 1013